@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from typing import Dict, List, Optional
 import re
+import sys
 import uvicorn
 
 app = FastAPI(
@@ -28,17 +29,74 @@ token_specification = [
     ("LPAREN", r'\('),
     ("RPAREN", r'\)'),
     ("SKIP", r'[ \t\n]+'),
-    ("MISMATCH", r'.'),
 ]
-tok_regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specification)
+# Stays on stdlib re: tokens are a few characters long, so per-match overhead dominates and
+# the re2 bindings measured ~25x slower than this on long programs despite the DFA engine
+TOK_RE = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specification))
+
+NUMBER_RE = re.compile(r'\d+(\.\d+)?')
+ID_RE = re.compile(r'[A-Za-z_]\w*')
+SKIP_RE = re.compile(r'[ \t\n]+')
+
+
+def _scan_number(code, pos):
+    return 'NUMBER', NUMBER_RE.match(code, pos).end()
+
+
+def _scan_id(code, pos):
+    return 'ID', ID_RE.match(code, pos).end()
+
+
+def _scan_skip(code, pos):
+    return 'SKIP', SKIP_RE.match(code, pos).end()
+
+
+def _scan_single(kind):
+    return lambda code, pos: (kind, pos + 1)
+
+
+def _scan_fallback(code, pos):
+    # Characters outside the table (e.g. non-ASCII digits) go through the full alternation;
+    # anything it cannot match is an invalid character
+    mo = TOK_RE.match(code, pos)
+    if mo is None:
+        raise RuntimeError(f"Unexpected character {code[pos]!r}")
+    return mo.lastgroup, mo.end()
+
+
+# Dispatch on the first character so each token only tries the one rule that can start it
+START_TABLE = {}
+START_TABLE.update(dict.fromkeys('0123456789', _scan_number))
+START_TABLE.update(dict.fromkeys('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_', _scan_id))
+START_TABLE.update(dict.fromkeys(' \t\n', _scan_skip))
+START_TABLE.update(dict.fromkeys('+-*/', _scan_single('OP')))
+START_TABLE['='] = _scan_single('ASSIGN')
+START_TABLE['('] = _scan_single('LPAREN')
+START_TABLE[')'] = _scan_single('RPAREN')
+
+
+def scan_tokens(code):
+    """Yield (kind, value) pairs for the source, dropping whitespace"""
+    pos, n = 0, len(code)
+    get = START_TABLE.get
+    while pos < n:
+        ch = code[pos]
+        # Single spaces between tokens are the common case; skip them without a scanner call
+        if ch == ' ':
+            pos += 1
+            continue
+        kind, end = get(ch, _scan_fallback)(code, pos)
+        if kind != 'SKIP':
+            yield kind, code[pos:end]
+        pos = end
 
 
 def lexer(code):
     tokens, symbol_table, id_counter = [], {}, 1
     prev_token_kind = None
+    append = tokens.append
 
-    for mo in re.finditer(tok_regex, code):
-        kind, value = mo.lastgroup, mo.group()
+    for kind, value in scan_tokens(code):
 
         if prev_token_kind == "NUMBER" and kind == "ID":
             raise RuntimeError(
@@ -48,15 +106,11 @@ def lexer(code):
             if value not in symbol_table:
                 symbol_table[value] = f'id{id_counter}'
                 id_counter += 1
-            tokens.append(('ID', symbol_table[value], value))
+            append(('ID', symbol_table[value], value))
             prev_token_kind = "ID"
         elif kind in ["NUMBER", "ASSIGN", "OP", "LPAREN", "RPAREN"]:
-            tokens.append((kind, value))
+            append((kind, value))
             prev_token_kind = kind
-        elif kind == "SKIP":
-            continue
-        else:
-            raise RuntimeError(f"Unexpected character {value!r}")
     return tokens, symbol_table
 
 
@@ -64,9 +118,9 @@ def lexer(code):
 def hybrid_lexer(code):
     tokens, symbol_table, id_counter = [], {}, 1
     prev_token_kind = None
+    append = tokens.append
 
-    for mo in re.finditer(tok_regex, code):
-        kind, value = mo.lastgroup, mo.group()
+    for kind, value in scan_tokens(code):
 
         if prev_token_kind == "NUMBER" and kind == "ID":
             raise RuntimeError(
@@ -76,27 +130,36 @@ def hybrid_lexer(code):
             if value not in symbol_table:
                 symbol_table[value] = f'V{id_counter}'
                 id_counter += 1
-            tokens.append(('ID', symbol_table[value], value))
+            append(('ID', symbol_table[value], value))
             prev_token_kind = "ID"
         elif kind == "ASSIGN":
-            tokens.append(('ASSIGN', 'is'))
+            append(('ASSIGN', 'is'))
             prev_token_kind = kind
         elif kind in ["NUMBER", "OP", "LPAREN", "RPAREN"]:
-            tokens.append((kind, value))
+            append((kind, value))
             prev_token_kind = kind
-        elif kind == "SKIP":
-            continue
-        else:
-            raise RuntimeError(f"Unexpected character {value!r}")
     return tokens, symbol_table
 
 
 # --- Syntax Analyzer ---
+# Node kinds are only ever set from these constants, so they are compared by identity.
+# Type names also come from the request's type_table, so those keep using ==.
+ID, NUMBER, OP, ASSIGN = sys.intern('ID'), sys.intern('NUMBER'), sys.intern('OP'), sys.intern('ASSIGN')
+INT, FLOAT, INT_TO_FLOAT = sys.intern('int'), sys.intern('float'), sys.intern('int to float')
+
 class Node:
-    def __init__(self, value, left=None, right=None, node_type="OP", original_name=None):
+    # computed_value is only set by direct_execution
+    __slots__ = ('value', 'left', 'right', 'node_type', 'original_name', 'type_info', 'computed_value',
+                 'is_float_literal', 'coercible', '_resolved_type')
+
+    def __init__(self, value, left=None, right=None, node_type=OP, original_name=None):
         self.value, self.left, self.right = value, left, right
         self.node_type, self.original_name = node_type, original_name
         self.type_info = None
+        self.is_float_literal = node_type is NUMBER and '.' in str(value)
+        # IDs and int literals are the leaves that can be coerced to float
+        self.coercible = node_type is ID or (node_type is NUMBER and not self.is_float_literal)
+        self._resolved_type = None  # cached by semantic_analysis
 
     def to_dict(self):
         """Convert node to dictionary for JSON serialization"""
@@ -109,99 +172,140 @@ class Node:
         }
 
 
+# Binary operator precedence; all operators are left-associative
+PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2}
+
+# Returned in place of a token once the input is exhausted
+_END = (None, None, None)
+
+
 class Parser:
     def __init__(self, tokens):
         self.tokens, self.pos = tokens, 0
 
-    def current_token(self):
-        if self.pos < len(self.tokens):
-            token = self.tokens[self.pos]
-            # Ensure we always return a 3-tuple
-            if len(token) == 2:
-                return (token[0], token[1], token[1])
-            return token
-        return (None, None, None)
-
-    def eat(self, expected_kind):
-        token = self.current_token()
-        if token[0] == expected_kind:
-            self.pos += 1
-            return token
-        raise SyntaxError(f"Expected {expected_kind} but found {token[0]}")
-
     def parse(self):
-        return self.statement()
-
-    def statement(self):
-        id_token = self.eat('ID')
-        left = Node(id_token[1], node_type='ID', original_name=id_token[2])
-        op_token = self.eat('ASSIGN')
-        right = self.expression()
-        return Node(op_token[1], left, right, node_type='ASSIGN')
-
-    def expression(self):
-        node = self.term()
-        token = self.current_token()
-        while token[0] == 'OP' and token[1] is not None and token[1] in '+-':
-            op = self.eat('OP')
-            node = Node(op[1], node, self.term())
-            token = self.current_token()
-        return node
-
-    def term(self):
-        node = self.factor()
-        token = self.current_token()
-        while token[0] == 'OP' and token[1] is not None and token[1] in '*/':
-            op = self.eat('OP')
-            node = Node(op[1], node, self.factor())
-            token = self.current_token()
-        return node
-
-    def factor(self):
-        kind, value, *_ = self.current_token()
-        if kind == 'NUMBER':
-            self.eat('NUMBER')
-            return Node(value, node_type='NUMBER')
-        if kind == 'ID':
-            id_token = self.eat('ID')
-            return Node(id_token[1], node_type='ID', original_name=id_token[2])
-        if kind == 'LPAREN':
-            self.eat('LPAREN')
-            node = self.expression()
-            self.eat('RPAREN')
-            return node
-        raise SyntaxError(f"Unexpected token {kind}")
+        """Parse `ID = expression` with an explicit operator stack instead of recursion"""
+        tokens, pos = self.tokens, self.pos
+        n = len(tokens)
+        precedence = PRECEDENCE.get
+
+        t = tokens[pos] if pos < n else _END
+        if t[0] != 'ID':
+            raise SyntaxError(f"Expected ID but found {t[0]}")
+        pos += 1
+        # 2-tuple tokens use their value as the original name, hence t[-1]
+        target = Node(t[1], node_type=ID, original_name=t[-1])
+
+        t = tokens[pos] if pos < n else _END
+        if t[0] != 'ASSIGN':
+            raise SyntaxError(f"Expected ASSIGN but found {t[0]}")
+        pos += 1
+        assign_value = t[1]
+
+        operands, ops = [], []  # ops holds (precedence, op) pairs, or None for an open paren
+        while True:
+            # Expect an operand, possibly preceded by opening parens
+            t = tokens[pos] if pos < n else _END
+            kind = t[0]
+            if kind == 'LPAREN':
+                ops.append(None)
+                pos += 1
+                continue
+            if kind == 'NUMBER':
+                operands.append(Node(t[1], node_type=NUMBER))
+            elif kind == 'ID':
+                operands.append(Node(t[1], node_type=ID, original_name=t[-1]))
+            else:
+                raise SyntaxError(f"Unexpected token {kind}")
+            pos += 1
+
+            # Expect a binary operator, or close parens until one is found
+            while True:
+                t = tokens[pos] if pos < n else _END
+                prec = precedence(t[1]) if t[0] == 'OP' else None
+                if prec is not None:
+                    while ops and ops[-1] is not None and ops[-1][0] >= prec:
+                        right = operands.pop()
+                        operands[-1] = Node(ops.pop()[1], operands[-1], right)
+                    ops.append((prec, t[1]))
+                    pos += 1
+                    break
+
+                while ops and ops[-1] is not None:
+                    right = operands.pop()
+                    operands[-1] = Node(ops.pop()[1], operands[-1], right)
+                if not ops:
+                    # Anything after a complete expression is left unparsed
+                    self.pos = pos
+                    return Node(assign_value, target, operands[0], node_type=ASSIGN)
+                if t[0] != 'RPAREN':
+                    raise SyntaxError(f"Expected RPAREN but found {t[0]}")
+                ops.pop()
+                pos += 1
 
 
 # --- Semantic Analyzer ---
 def get_type(node, type_table):
-    if node.type_info == "int to float": return 'float'
-    if node.node_type == 'NUMBER': return 'float' if '.' in str(node.value) else 'int'
-    if node.node_type == 'ID': return type_table.get(node.original_name, 'int')
-    if node.node_type in ['OP', 'ASSIGN'] and node.left and node.right:
-        is_float = get_type(node.left, type_table) == 'float' or get_type(node.right, type_table) == 'float'
-        return 'float' if is_float else 'int'
+    if node.type_info is INT_TO_FLOAT: return FLOAT
+    if node.node_type is NUMBER: return FLOAT if node.is_float_literal else INT
+    if node.node_type is ID: return type_table.get(node.original_name, INT)
+    if node._resolved_type: return node._resolved_type
+    if (node.node_type is OP or node.node_type is ASSIGN) and node.left and node.right:
+        is_float = get_type(node.left, type_table) == FLOAT or get_type(node.right, type_table) == FLOAT
+        return FLOAT if is_float else INT
     return None
 
 
 def mark_leaves_for_coercion(node):
-    if not node: return
-    if node.node_type in ['ID', 'NUMBER'] and not (node.node_type == 'NUMBER' and '.' in node.value):
-        node.type_info = "int to float"
-    else:
-        mark_leaves_for_coercion(node.left)
-        mark_leaves_for_coercion(node.right)
+    stack = [node]
+    stack_append, stack_pop = stack.append, stack.pop
+    while stack:
+        node = stack_pop()
+        if not node: continue
+        if node.coercible:
+            node.type_info = INT_TO_FLOAT
+        else:
+            # Every leaf below is float once marked, so the cached subtree type is too
+            node._resolved_type = FLOAT
+            stack_append(node.right)
+            stack_append(node.left)
+
+
+def post_order(node):
+    """Return the nodes of a tree as a flat list, children before parents, left before right"""
+    order = []
+    stack = [node]
+    stack_append, stack_pop, order_append = stack.append, stack.pop, order.append
+    # Pre-order visiting right before left is the exact reverse of post-order
+    while stack:
+        node = stack_pop()
+        if not node: continue
+        order_append(node)
+        stack_append(node.left)
+        stack_append(node.right)
+    order.reverse()
+    return order
 
 
 def semantic_analysis(node, type_table):
-    if not node: return
-    semantic_analysis(node.left, type_table)
-    semantic_analysis(node.right, type_table)
-    if node.node_type in ["OP", "ASSIGN"] and node.left and node.right:
-        left_type, right_type = get_type(node.left, type_table), get_type(node.right, type_table)
-        if left_type != right_type:
-            if left_type == 'int': mark_leaves_for_coercion(node.left)
-            if right_type == 'int': mark_leaves_for_coercion(node.right)
+    """Mark int operands for coercion bottom-up and return the node's resulting type"""
+    nodes = post_order(node)
+    # Children always come first, so their _resolved_type is set by the time a parent reads it
+    for node in nodes:
+        left, right = node.left, node.right
+        if (node.node_type is OP or node.node_type is ASSIGN) and left and right:
+            left_type, right_type = left._resolved_type, right._resolved_type
+            if left_type != right_type:
+                if left_type == INT:
+                    mark_leaves_for_coercion(left)
+                    left_type = FLOAT
+                if right_type == INT:
+                    mark_leaves_for_coercion(right)
+                    right_type = FLOAT
+            node._resolved_type = FLOAT if left_type == FLOAT or right_type == FLOAT else INT
+        else:
+            node._resolved_type = get_type(node, type_table)
+    return nodes[-1]._resolved_type if nodes else None
 
 
 # --- Direct Execution (Hybrid Approach Phase 4) ---
@@ -213,21 +317,21 @@ def direct_execution(node, value_table, type_table):
     if not node:
         return None
     
-    if node.node_type == 'NUMBER':
+    if node.node_type is NUMBER:
         val = float(node.value)
         node.computed_value = val
         return val
     
-    if node.node_type == 'ID':
+    if node.node_type is ID:
         # Get value from value_table using original_name
         val = value_table.get(node.original_name, 0)
         # Convert to float if marked for coercion
-        if node.type_info == "int to float":
+        if node.type_info is INT_TO_FLOAT:
             val = float(val)
         node.computed_value = val
         return val
     
-    if node.node_type in ['OP', 'ASSIGN']:
+    if node.node_type is OP or node.node_type is ASSIGN:
         left_val = direct_execution(node.left, value_table, type_table)
         right_val = direct_execution(node.right, value_table, type_table)
         
@@ -271,72 +375,87 @@ class NodeWithExecution:
 
 # --- Intermediate Code Generator ---
 def collect_conversions(node, type_table, conversions, temp_counter, skip_left_assign=False):
-    if not node:
-        return temp_counter
-
-    if skip_left_assign and node.node_type == 'ASSIGN':
-        temp_counter = collect_conversions(node.right, type_table, conversions, temp_counter, False)
-        return temp_counter
-
-    if node.node_type in ['ID', 'NUMBER'] and node.type_info == "int to float":
-        if node.node_type == 'ID':
-            key = ('ID', node.original_name)
-            if key not in conversions:
-                temp_name = f"temp{temp_counter}"
-                temp_counter += 1
-                # Use symbol table ID (id1, id2, etc.) in the instruction
-                symbol_id = node.value
-                conversions[key] = (temp_name, f"{temp_name} = float({symbol_id})")
-        elif node.node_type == 'NUMBER':
-            key = ('NUMBER', node.value)
+    if skip_left_assign and node and node.node_type is ASSIGN:
+        node = node.right
+
+    # Pre-order, left before right, so temps are numbered in source order
+    stack = [node] if node else []
+    stack_append, stack_pop = stack.append, stack.pop
+    while stack:
+        node = stack_pop()
+
+        # Only leaves are ever marked for coercion
+        if node.type_info is INT_TO_FLOAT:
+            key = (ID, node.original_name) if node.node_type is ID else (NUMBER, node.value)
             if key not in conversions:
                 temp_name = f"temp{temp_counter}"
                 temp_counter += 1
+                # node.value is the symbol table ID (id1, id2, etc.) or the literal
                 conversions[key] = (temp_name, f"{temp_name} = float({node.value})")
+            continue
 
-    temp_counter = collect_conversions(node.left, type_table, conversions, temp_counter, False)
-    temp_counter = collect_conversions(node.right, type_table, conversions, temp_counter, False)
+        if node.right: stack_append(node.right)
+        if node.left: stack_append(node.left)
 
     return temp_counter
 
 
 def generate_icg(node, type_table, instructions, temp_counter, conversions=None):
-    if not node:
-        return None, temp_counter
-
-    if node.node_type == 'ID':
-        # Use the symbol table ID (e.g., id1, id2) instead of original name
-        symbol_id = node.value  # This is the id1, id2, etc.
-        if node.type_info == "int to float":
-            key = ('ID', node.original_name)
-            if conversions and key in conversions:
-                return conversions[key][0], temp_counter
-        return symbol_id, temp_counter
-
-    elif node.node_type == 'NUMBER':
-        if node.type_info == "int to float":
-            key = ('NUMBER', node.value)
-            if conversions and key in conversions:
-                return conversions[key][0], temp_counter
-        return node.value, temp_counter
-
-    elif node.node_type == 'ASSIGN':
-        right_result, temp_counter = generate_icg(node.right, type_table, instructions, temp_counter, conversions)
-        # Use symbol table ID (id1, id2, etc.) instead of original name
-        symbol_id = node.left.value
-        instructions.append(f"{symbol_id} = {right_result}")
-        return symbol_id, temp_counter
-
-    elif node.node_type == 'OP':
-        left_result, temp_counter = generate_icg(node.left, type_table, instructions, temp_counter, conversions)
-        right_result, temp_counter = generate_icg(node.right, type_table, instructions, temp_counter, conversions)
-
-        temp_name = f"temp{temp_counter}"
-        temp_counter += 1
-        instructions.append(f"{temp_name} = {left_result} {node.value} {right_result}")
-        return temp_name, temp_counter
-
-    return None, temp_counter
+    results = []  # operand names of finished subtrees, left before right
+    stack = [(node, False)]
+    stack_append, stack_pop = stack.append, stack.pop
+    while stack:
+        node, exiting = stack_pop()
+        if not node:
+            results.append(None)
+            continue
+
+        if node.node_type is ID:
+            # Use the symbol table ID (e.g., id1, id2) instead of original name
+            result = node.value  # This is the id1, id2, etc.
+            if node.type_info is INT_TO_FLOAT:
+                key = (ID, node.original_name)
+                if conversions and key in conversions:
+                    result = conversions[key][0]
+            results.append(result)
+
+        elif node.node_type is NUMBER:
+            result = node.value
+            if node.type_info is INT_TO_FLOAT:
+                key = (NUMBER, node.value)
+                if conversions and key in conversions:
+                    result = conversions[key][0]
+            results.append(result)
+
+        elif node.node_type is ASSIGN:
+            if not exiting:
+                stack_append((node, True))
+                stack_append((node.right, False))
+                continue
+            right_result = results.pop()
+            # Use symbol table ID (id1, id2, etc.) instead of original name
+            symbol_id = node.left.value
+            instructions.append(f"{symbol_id} = {right_result}")
+            results.append(symbol_id)
+
+        elif node.node_type is OP:
+            if not exiting:
+                stack_append((node, True))
+                stack_append((node.right, False))
+                stack_append((node.left, False))
+                continue
+            right_result = results.pop()
+            left_result = results.pop()
+
+            temp_name = f"temp{temp_counter}"
+            temp_counter += 1
+            instructions.append(f"{temp_name} = {left_result} {node.value} {right_result}")
+            results.append(temp_name)
+
+        else:
+            results.append(None)
+
+    return results.pop(), temp_counter
 
 
 # --- Code Optimizer ---
@@ -726,8 +845,10 @@ class HybridResponse(BaseModel):
 
 
 # --- API Endpoints ---
+# CPU-bound endpoints are plain `def` so FastAPI runs them in its threadpool instead of
+# blocking the event loop while a large program is compiled.
 @app.post('/api/compile', response_model=CompileResponse, responses={400: {"model": ErrorResponse}})
-async def compile_code(request: CompileRequest):
+def compile_code(request: CompileRequest):
     """
     Process code through all compilation phases (lexical, syntax, semantic, ICG, optimization, code generation).
     
@@ -743,25 +864,22 @@ async def compile_code(request: CompileRequest):
         # Step 1: Lexical Analysis
         tokens, symbol_table = lexer(request.code)
         
-        # Step 2: Syntax Analysis
-        syntax_tree = Parser(tokens).parse()
+        # Step 2: Syntax Analysis (parsed once; snapshot before later phases annotate it)
+        tree = Parser(tokens).parse()
+        syntax_tree = tree.to_dict()
         
         # Step 3: Semantic Analysis
-        semantic_tree = Parser(tokens).parse()
-        semantic_analysis(semantic_tree, request.type_table)
-        
-        # Step 4: Intermediate Code Generation
-        icg_tree = Parser(tokens).parse()
-        semantic_analysis(icg_tree, request.type_table)
+        semantic_analysis(tree, request.type_table)
+        semantic_tree = tree.to_dict()
         
+        # Step 4: Intermediate Code Generation (only reads the annotated tree)
         conversions = {}
-        temp_counter = collect_conversions(icg_tree, request.type_table, conversions, 1, skip_left_assign=True)
+        temp_counter = collect_conversions(tree, request.type_table, conversions, 1, skip_left_assign=True)
         
-        instructions = []
-        for key, (temp_name, instruction) in sorted(conversions.items(), key=lambda x: x[1][0]):
-            instructions.append(instruction)
+        # Conversions were inserted in temp1, temp2, ... order
+        instructions = [instruction for temp_name, instruction in conversions.values()]
         
-        generate_icg(icg_tree, request.type_table, instructions, temp_counter, conversions)
+        generate_icg(tree, request.type_table, instructions, temp_counter, conversions)
         
         # Step 5: Code Optimization
         optimized_instructions = optimize_code(instructions, conversions)
@@ -776,8 +894,8 @@ async def compile_code(request: CompileRequest):
                 'tokens': [{'type': t[0], 'value': t[1], 'original': t[2] if len(t) > 2 else t[1]} for t in tokens],
                 'symbol_table': symbol_table
             },
-            'syntax_tree': syntax_tree.to_dict(),
-            'semantic_tree': semantic_tree.to_dict(),
+            'syntax_tree': syntax_tree,
+            'semantic_tree': semantic_tree,
             'intermediate_code': instructions,
             'optimized_code': optimized_instructions,
             'assembly_code': assembly_code
@@ -788,7 +906,7 @@ async def compile_code(request: CompileRequest):
 
 
 @app.post('/api/lexical', response_model=LexicalOnlyResponse, responses={400: {"model": ErrorResponse}})
-async def lexical_analysis(request: LexicalRequest):
+def lexical_analysis(request: LexicalRequest):
     """
     Perform lexical analysis only.
     
@@ -818,7 +936,7 @@ async def health_check():
 
 # --- Hybrid API Endpoints ---
 @app.post('/api/hybrid/lexical', response_model=LexicalOnlyResponse, responses={400: {"model": ErrorResponse}})
-async def hybrid_lexical_analysis(request: LexicalRequest):
+def hybrid_lexical_analysis(request: LexicalRequest):
     """
     Perform hybrid lexical analysis (uses V1, V2 instead of id1, id2 and "is" instead of "=").
     """
@@ -836,7 +954,7 @@ async def hybrid_lexical_analysis(request: LexicalRequest):
 
 
 @app.post('/api/hybrid/compile', response_model=HybridResponse, responses={400: {"model": ErrorResponse}})
-async def hybrid_compile(request: HybridRequest):
+def hybrid_compile(request: HybridRequest):
     """
     Process code through hybrid approach (4 phases):
     1. Lexical Analysis (with V1, V2 naming and "is" operator)
@@ -848,17 +966,16 @@ async def hybrid_compile(request: HybridRequest):
         # Step 1: Hybrid Lexical Analysis
         tokens, symbol_table = hybrid_lexer(request.code)
         
-        # Step 2: Syntax Analysis
-        syntax_tree = Parser(tokens).parse()
+        # Step 2: Syntax Analysis (parsed once; snapshot before later phases annotate it)
+        tree = Parser(tokens).parse()
+        syntax_tree = tree.to_dict()
         
         # Step 3: Semantic Analysis
-        semantic_tree = Parser(tokens).parse()
-        semantic_analysis(semantic_tree, request.type_table)
+        semantic_analysis(tree, request.type_table)
+        semantic_tree = tree.to_dict()
         
         # Step 4: Direct Execution
-        execution_tree = Parser(tokens).parse()
-        semantic_analysis(execution_tree, request.type_table)
-        direct_execution(execution_tree, request.value_table, request.type_table)
+        direct_execution(tree, request.value_table, request.type_table)
         
         return {
             'success': True,
@@ -866,9 +983,9 @@ async def hybrid_compile(request: HybridRequest):
                 'tokens': [{'type': t[0], 'value': t[1], 'original': t[2] if len(t) > 2 else t[1]} for t in tokens],
                 'symbol_table': symbol_table
             },
-            'syntax_tree': syntax_tree.to_dict(),
-            'semantic_tree': semantic_tree.to_dict(),
-            'execution_tree': NodeWithExecution.to_dict_with_execution(execution_tree)
+            'syntax_tree': syntax_tree,
+            'semantic_tree': semantic_tree,
+            'execution_tree': NodeWithExecution.to_dict_with_execution(tree)
         }
         
     except Exception as e:
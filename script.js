@@ -50,6 +50,9 @@ tabBtns.forEach(btn => {
 
 let currentSymbolTable = {};
 let hybridSymbolTable = {};
+// Selected variable types, kept in sync by change events so compiling doesn't re-read every select
+let currentTypeTable = {};
+let hybridTypeTable = {};
 
 // ============== COMPILER TAB Event Listeners ==============
 analyzeBtn.addEventListener('click', analyzeLexical);
@@ -58,6 +61,9 @@ resetBtn.addEventListener('click', reset);
 codeInput.addEventListener('keypress', (e) => {
     if (e.key === 'Enter') analyzeLexical();
 });
+typeInputs.addEventListener('change', (e) => {
+    currentTypeTable[e.target.dataset.var] = e.target.value;
+});
 
 // ============== HYBRID TAB Event Listeners ==============
 hybridAnalyzeBtn.addEventListener('click', hybridAnalyzeLexical);
@@ -66,6 +72,9 @@ hybridResetBtn.addEventListener('click', hybridReset);
 hybridCodeInput.addEventListener('keypress', (e) => {
     if (e.key === 'Enter') hybridAnalyzeLexical();
 });
+hybridTypeInputs.addEventListener('change', (e) => {
+    hybridTypeTable[e.target.dataset.var] = e.target.value;
+});
 
 // Analyze lexical (first step)
 async function analyzeLexical() {
@@ -169,6 +178,7 @@ function showTypeInputs(symbolTable) {
     const inputVariables = variables.filter(v => v !== assignedVar);
     
     if (inputVariables.length === 0) {
+        currentTypeTable = {};
         typeTableSection.style.display = 'none';
         return;
     }
@@ -176,25 +186,19 @@ function showTypeInputs(symbolTable) {
     typeInputs.innerHTML = inputVariables.map(varName => `
         <div class="type-input-group">
             <label>${varName}:</label>
-            <select id="type-${varName}">
+            <select id="type-${varName}" data-var="${varName}">
                 <option value="int">int</option>
                 <option value="float">float</option>
             </select>
         </div>
     `).join('');
+    currentTypeTable = Object.fromEntries(inputVariables.map(varName => [varName, 'int']));
 
     typeTableSection.style.display = 'block';
 }
 
 function getTypeTable() {
-    const typeTable = {};
-    for (const varName of Object.keys(currentSymbolTable)) {
-        const select = document.getElementById(`type-${varName}`);
-        if (select) {
-            typeTable[varName] = select.value;
-        }
-    }
-    return typeTable;
+    return currentTypeTable;
 }
 
 function displaySyntaxTree(tree) {
@@ -264,6 +268,8 @@ function drawTreeLines(container) {
     
     // Find all parent nodes with children
     const nodes = container.querySelectorAll('.tree-node');
+    // Collect every line as markup and insert them in one go
+    const lines = [];
     
     nodes.forEach(node => {
         const parentValue = node.querySelector(':scope > .tree-node-value');
@@ -281,15 +287,11 @@ function drawTreeLines(container) {
                 const childX = childRect.left + childRect.width / 2 - containerRect.left;
                 const childY = childRect.top - containerRect.top;
                 
-                const line = document.createElementNS('http://www.w3.org/2000/svg', 'line');
-                line.setAttribute('x1', parentX);
-                line.setAttribute('y1', parentY);
-                line.setAttribute('x2', childX);
-                line.setAttribute('y2', childY);
-                svg.appendChild(line);
+                lines.push(`<line x1="${parentX}" y1="${parentY}" x2="${childX}" y2="${childY}"></line>`);
             });
         }
     });
+    svg.innerHTML = lines.join('');
     
     container.insertBefore(svg, container.firstChild);
 }
@@ -329,6 +331,7 @@ function clearOutputs() {
 function reset() {
     codeInput.value = '';
     currentSymbolTable = {};
+    currentTypeTable = {};
     typeTableSection.style.display = 'none';
     typeInputs.innerHTML = '';
     compileBtn.disabled = true;
@@ -439,6 +442,7 @@ function showHybridTypeInputs(symbolTable) {
     const inputVariables = variables.filter(v => v !== assignedVar);
     
     if (inputVariables.length === 0) {
+        hybridTypeTable = {};
         hybridTypeTableSection.style.display = 'none';
         return;
     }
@@ -446,12 +450,13 @@ function showHybridTypeInputs(symbolTable) {
     hybridTypeInputs.innerHTML = inputVariables.map(varName => `
         <div class="type-input-group">
             <label>${varName}:</label>
-            <select id="hybrid-type-${varName}">
+            <select id="hybrid-type-${varName}" data-var="${varName}">
                 <option value="int">int</option>
                 <option value="float">float</option>
             </select>
         </div>
     `).join('');
+    hybridTypeTable = Object.fromEntries(inputVariables.map(varName => [varName, 'int']));
 
     hybridTypeTableSection.style.display = 'block';
 }
@@ -485,14 +490,7 @@ function showHybridValueInputs(symbolTable) {
 }
 
 function getHybridTypeTable() {
-    const typeTable = {};
-    for (const varName of Object.keys(hybridSymbolTable)) {
-        const select = document.getElementById(`hybrid-type-${varName}`);
-        if (select) {
-            typeTable[varName] = select.value;
-        }
-    }
-    return typeTable;
+    return hybridTypeTable;
 }
 
 function getHybridValueTable() {
@@ -606,6 +604,7 @@ function clearHybridOutputs() {
 function hybridReset() {
     hybridCodeInput.value = '';
     hybridSymbolTable = {};
+    hybridTypeTable = {};
     hybridTypeTableSection.style.display = 'none';
     hybridValueTableSection.style.display = 'none';
     hybridTypeInputs.innerHTML = '';